@@ -1,14 +1,19 @@
+import asyncio
+import hashlib
+import re
 import uuid
 from abc import ABC, abstractmethod
 from typing import List
 
 import weaviate
 from astrapy.db import AstraDB
+from cachetools import LRUCache, TTLCache
+from cohere import AsyncClient as CohereAsyncClient
 from decouple import config
-from pinecone import Pinecone, ServerlessSpec
-from qdrant_client import QdrantClient
+from pinecone import ServerlessSpec
+from pinecone.grpc import PineconeGRPC as Pinecone
+from qdrant_client import AsyncQdrantClient
 from qdrant_client.http import models as rest
-from tqdm import tqdm
 
 from encoders.base import BaseEncoder
 from encoders.openai import OpenAIEncoder
@@ -17,6 +22,59 @@ from models.document import BaseDocumentChunk
 from models.vector_database import VectorDatabase
 from utils.logger import logger
 
+PINECONE_UPSERT_BATCH_SIZE = 100
+QDRANT_UPSERT_BATCH_SIZE = 256
+ASTRA_UPSERT_BATCH_SIZE = 20  # insert_many accepts at most 20 documents
+ASTRA_UPSERT_CONCURRENCY = 8
+
+# Metadata keys stripped from query matches before building document chunks
+_SKIP_METADATA_KEYS = frozenset(("content", "file_url"))
+
+# Rerank scores keyed on (query hash, chunk hash) so repeated queries
+# within the TTL skip the Cohere round-trip.
+_RERANK_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=900)
+
+# Query embeddings keyed on (encoder class, input) so repeated queries
+# skip the embedding API call.
+_EMBEDDING_CACHE: TTLCache = TTLCache(maxsize=4096, ttl=900)
+
+# Index/collection existence keyed on (provider, index name, credentials)
+# so service construction skips the list-indexes round-trip in steady state.
+# Credentials are part of the key because the same index name can exist in
+# one tenant's project but not another's.
+_INDEX_EXISTS_CACHE: TTLCache = TTLCache(maxsize=128, ttl=300)
+
+
+def _index_cache_key(provider: str, index_name: str, credentials: dict) -> tuple:
+    return (provider, index_name, tuple(sorted(credentials.items())))
+
+
+_COHERE_CLIENT: CohereAsyncClient | None = None
+
+
+def _get_cohere_client() -> CohereAsyncClient:
+    """Lazily build a single async Cohere client so its HTTP session (and
+    the TLS connection behind it) is reused across queries."""
+    global _COHERE_CLIENT
+    if _COHERE_CLIENT is None:
+        api_key = config("COHERE_API_KEY")
+        if not api_key:
+            raise ValueError("API key for Cohere is not present.")
+        _COHERE_CLIENT = CohereAsyncClient(api_key=api_key)
+    return _COHERE_CLIENT
+
+
+# Queries that look like a filename, e.g. "report.pdf"
+_FILENAME_QUERY = re.compile(r"[\w./-]+\.\w{1,5}")
+
+
+def _is_literal_query(query: str) -> bool:
+    """Exact-phrase or filename lookups where the vector ranking is
+    already correct and reranking would only add a round-trip."""
+    if len(query) >= 2 and query.startswith('"') and query.endswith('"'):
+        return True
+    return _FILENAME_QUERY.fullmatch(query) is not None
+
 
 class VectorService(ABC):
     def __init__(
@@ -35,53 +93,81 @@ class VectorService(ABC):
     async def query(self, input: str, top_k: int = 25) -> List[BaseDocumentChunk]:
         pass
 
+    @abstractmethod
+    async def _search_with_vector(
+        self, vector: List[float], top_k: int
+    ) -> List[BaseDocumentChunk]:
+        pass
+
     @abstractmethod
     async def delete(self, file_url: str) -> DeleteResponse:
         pass
 
     async def _generate_vectors(self, input: str) -> List[List[float]]:
-        return self.encoder([input])
+        cache_key = (type(self.encoder).__name__, input)
+        cached = _EMBEDDING_CACHE.get(cache_key)
+        if cached is not None:
+            return [list(cached)]
+        vectors = self.encoder([input])
+        _EMBEDDING_CACHE[cache_key] = tuple(vectors[0])
+        return vectors
 
     async def rerank(
         self, query: str, documents: list[BaseDocumentChunk], top_n: int = 5
     ) -> list[BaseDocumentChunk]:
-        from cohere import Client
-
-        api_key = config("COHERE_API_KEY")
-        if not api_key:
-            raise ValueError("API key for Cohere is not present.")
-        cohere_client = Client(api_key=api_key)
+        if _is_literal_query(query):
+            return documents[:top_n]
 
         # Avoid duplications, TODO: fix ingestion for duplications
-        # Deduplicate documents based on content while preserving order
-        seen = set()
-        deduplicated_documents = [
-            doc
-            for doc in documents
-            if doc.content not in seen and not seen.add(doc.content)
-        ]
-        docs_text = list(
-            doc.content
-            for doc in tqdm(
-                deduplicated_documents,
-                desc=f"Reranking {len(deduplicated_documents)} documents",
-            )
-        )
+        # Deduplicate documents on a short content fingerprint (preserving
+        # order) instead of set-hashing multi-KB strings; the digests are
+        # reused below for the rerank score cache.
+        seen: set[bytes] = set()
+        deduplicated_documents: list[tuple[BaseDocumentChunk, bytes]] = []
+        for doc in documents:
+            chunk_hash = hashlib.blake2b(
+                doc.content.encode("utf-8"), digest_size=16
+            ).digest()
+            if chunk_hash not in seen:
+                seen.add(chunk_hash)
+                deduplicated_documents.append((doc, chunk_hash))
+        # Fewer candidates than requested: reranking can't change what is
+        # returned, only its order, so skip the round-trip.
+        if len(deduplicated_documents) <= top_n:
+            return [doc for doc, _ in deduplicated_documents]
+
+        cohere_client = _get_cohere_client()
+        query_hash = hashlib.blake2b(query.encode("utf-8"), digest_size=16).digest()
+        scored_documents: list[tuple[BaseDocumentChunk, float]] = []
+        uncached_documents: list[tuple[BaseDocumentChunk, bytes]] = []
+        logger.info(f"Reranking {len(deduplicated_documents)} documents")
+        for doc, chunk_hash in deduplicated_documents:
+            cached_score = _RERANK_CACHE.get((query_hash, chunk_hash))
+            if cached_score is not None:
+                scored_documents.append((doc, cached_score))
+            else:
+                uncached_documents.append((doc, chunk_hash))
         try:
-            re_ranked = cohere_client.rerank(
-                model="rerank-multilingual-v2.0",
-                query=query,
-                documents=docs_text,
-                top_n=top_n,
-            ).results
-            results = []
-            for r in tqdm(re_ranked, desc="Processing reranked results "):
-                doc = deduplicated_documents[r.index]
-                results.append(doc)
-            return results
+            if uncached_documents:
+                re_ranked = (
+                    await cohere_client.rerank(
+                        model="rerank-multilingual-v2.0",
+                        query=query,
+                        documents=[doc.content for doc, _ in uncached_documents],
+                        top_n=len(uncached_documents),
+                    )
+                ).results
+                for r in re_ranked:
+                    doc, chunk_hash = uncached_documents[r.index]
+                    _RERANK_CACHE[(query_hash, chunk_hash)] = r.relevance_score
+                    scored_documents.append((doc, r.relevance_score))
+            scored_documents.sort(key=lambda pair: pair[1], reverse=True)
+            return [doc for doc, _ in scored_documents[:top_n]]
         except Exception as e:
+            # Fall back to the vector-search ordering rather than failing
+            # the whole query when Cohere is unreachable.
             logger.error(f"Error while reranking: {e}")
-            raise Exception(f"Error while reranking: {e}")
+            return [doc for doc, _ in deduplicated_documents[:top_n]]
 
 
 class PineconeVectorService(VectorService):
@@ -95,27 +181,28 @@ class PineconeVectorService(VectorService):
             encoder=encoder,
         )
         pinecone = Pinecone(api_key=credentials["api_key"])
-        if index_name not in [index.name for index in pinecone.list_indexes()]:
-            pinecone.create_index(
-                name=self.index_name,
-                dimension=dimension,
-                metric="dotproduct",
-                spec=ServerlessSpec(cloud="aws", region="us-west-2"),
-            )
+        cache_key = _index_cache_key("pinecone", index_name, credentials)
+        if not _INDEX_EXISTS_CACHE.get(cache_key):
+            if index_name not in [index.name for index in pinecone.list_indexes()]:
+                pinecone.create_index(
+                    name=self.index_name,
+                    dimension=dimension,
+                    metric="dotproduct",
+                    spec=ServerlessSpec(cloud="aws", region="us-west-2"),
+                )
+            _INDEX_EXISTS_CACHE[cache_key] = True
         self.index = pinecone.Index(name=self.index_name)
 
-    # TODO: add batch size
     async def upsert(self, chunks: List[BaseDocumentChunk]):
         if self.index is None:
             raise ValueError(f"Pinecone index {self.index_name} is not initialized.")
 
         # Prepare the data for upserting into Pinecone
-        vectors_to_upsert = []
-        for chunk in tqdm(
-            chunks,
-            desc=f"Upserting {len(chunks)} chunks to Pinecone index {self.index_name}",
-        ):
-            vector_data = {
+        logger.info(
+            f"Upserting {len(chunks)} chunks to Pinecone index {self.index_name}"
+        )
+        vectors_to_upsert = [
+            {
                 "id": chunk.id,
                 "values": chunk.dense_embedding,
                 "metadata": {
@@ -125,17 +212,36 @@ class PineconeVectorService(VectorService):
                     **(chunk.metadata if chunk.metadata else {}),
                 },
             }
-            vectors_to_upsert.append(vector_data)
-        self.index.upsert(vectors=vectors_to_upsert)
+            for chunk in chunks
+        ]
+        # Batches of 100 stay under Pinecone's request size limit; firing them
+        # as async requests overlaps the network round-trips. Waiting on the
+        # futures happens in a worker thread so the event loop stays free.
+        async_results = [
+            self.index.upsert(
+                vectors=vectors_to_upsert[i : i + PINECONE_UPSERT_BATCH_SIZE],
+                async_req=True,
+            )
+            for i in range(0, len(vectors_to_upsert), PINECONE_UPSERT_BATCH_SIZE)
+        ]
+        await asyncio.to_thread(lambda: [result.result() for result in async_results])
 
     async def query(
         self, input: str, top_k: int = 25, include_metadata: bool = True
+    ) -> list[BaseDocumentChunk]:
+        query_vectors = await self._generate_vectors(input=input)
+        return await self._search_with_vector(
+            query_vectors[0], top_k, include_metadata=include_metadata
+        )
+
+    async def _search_with_vector(
+        self, vector: List[float], top_k: int, include_metadata: bool = True
     ) -> list[BaseDocumentChunk]:
         if self.index is None:
             raise ValueError(f"Pinecone index {self.index_name} is not initialized.")
-        query_vectors = await self._generate_vectors(input=input)
-        results = self.index.query(
-            vector=query_vectors[0],
+        results = await asyncio.to_thread(
+            self.index.query,
+            vector=vector,
             top_k=top_k,
             include_metadata=include_metadata,
         )
@@ -152,7 +258,7 @@ class PineconeVectorService(VectorService):
                 metadata={
                     key: value
                     for key, value in match["metadata"].items()
-                    if key not in ["content", "file_url"]
+                    if key not in _SKIP_METADATA_KEYS
                 },
             )
             document_chunks.append(document_chunk)
@@ -162,20 +268,43 @@ class PineconeVectorService(VectorService):
         if self.index is None:
             raise ValueError(f"Pinecone index {self.index_name} is not initialized.")
 
-        query_response = self.index.query(
-            vector=[0.0] * self.dimension,
-            top_k=1000,
-            include_metadata=True,
-            filter={"source": {"$eq": file_url}},
-        )
-        chunks = query_response.matches
+        # Serverless indexes don't support delete-by-metadata-filter, so page
+        # through the matches and delete by id until none are left. This also
+        # handles files with more than one query page worth of chunks.
+        def _delete_matches() -> int:
+            # Pinecone is eventually consistent, so a query right after a
+            # delete can still return the ids just deleted; track them so
+            # they are neither re-deleted nor double-counted, and stop once
+            # a page brings nothing new.
+            deleted_ids: set[str] = set()
+            while True:
+                query_response = self.index.query(
+                    vector=[0.0] * self.dimension,
+                    top_k=10_000,
+                    include_values=False,
+                    include_metadata=False,
+                    filter={"source": {"$eq": file_url}},
+                )
+                chunk_ids = [
+                    match["id"]
+                    for match in query_response.matches
+                    if match["id"] not in deleted_ids
+                ]
+                if not chunk_ids:
+                    return len(deleted_ids)
+                async_results = [
+                    self.index.delete(ids=chunk_ids[i : i + 1000], async_req=True)
+                    for i in range(0, len(chunk_ids), 1000)
+                ]
+                [result.result() for result in async_results]
+                deleted_ids.update(chunk_ids)
+
+        num_of_deleted_chunks = await asyncio.to_thread(_delete_matches)
         logger.info(
-            f"Deleting {len(chunks)} chunks from Pinecone {self.index_name} index."
+            f"Deleted {num_of_deleted_chunks} chunks from Pinecone "
+            f"{self.index_name} index."
         )
-
-        if chunks:
-            self.index.delete(ids=[chunk["id"] for chunk in chunks])
-        return DeleteResponse(num_of_deleted_chunks=len(chunks))
+        return DeleteResponse(num_of_deleted_chunks=num_of_deleted_chunks)
 
 
 class QdrantService(VectorService):
@@ -188,38 +317,50 @@ class QdrantService(VectorService):
             credentials=credentials,
             encoder=encoder,
         )
-        self.client = QdrantClient(
-            url=credentials["host"], api_key=credentials["api_key"], https=True
+        self.client = AsyncQdrantClient(
+            url=credentials["host"],
+            api_key=credentials["api_key"],
+            https=True,
+            prefer_grpc=True,
+            grpc_port=6334,
         )
-        collections = self.client.get_collections()
-        if index_name not in [c.name for c in collections.collections]:
-            self.client.create_collection(
+        self._collection_checked = False
+
+    async def _ensure_collection(self) -> None:
+        """Create the collection on first use; __init__ can't await."""
+        cache_key = _index_cache_key("qdrant", self.index_name, self.credentials)
+        if self._collection_checked or _INDEX_EXISTS_CACHE.get(cache_key):
+            self._collection_checked = True
+            return
+        collections = await self.client.get_collections()
+        if self.index_name not in [c.name for c in collections.collections]:
+            await self.client.create_collection(
                 collection_name=self.index_name,
                 vectors_config={
                     "content": rest.VectorParams(
-                        size=dimension, distance=rest.Distance.COSINE
+                        size=self.dimension, distance=rest.Distance.COSINE
                     )
                 },
                 optimizers_config=rest.OptimizersConfigDiff(
                     indexing_threshold=0,
                 ),
+                # Store an int8 copy server-side: quarter the memory per
+                # vector and faster distance computation during search.
+                quantization_config=rest.ScalarQuantization(
+                    scalar=rest.ScalarQuantizationConfig(
+                        type=rest.ScalarType.INT8,
+                        always_ram=True,
+                    )
+                ),
             )
-
-    # TODO: remove this
-    async def convert_to_rerank_format(self, chunks: List[rest.PointStruct]):
-        docs = [
-            {
-                "content": chunk.payload.get("content"),
-                "page_label": chunk.payload.get("page_label"),
-                "file_url": chunk.payload.get("file_url"),
-            }
-            for chunk in chunks
-        ]
-        return docs
+        self._collection_checked = True
+        _INDEX_EXISTS_CACHE[cache_key] = True
 
     async def upsert(self, chunks: List[BaseDocumentChunk]) -> None:
+        await self._ensure_collection()
+        logger.info(f"Upserting {len(chunks)} chunks to Qdrant")
         points = []
-        for chunk in tqdm(chunks, desc="Upserting to Qdrant"):
+        for chunk in chunks:
             points.append(
                 rest.PointStruct(
                     id=chunk.id,
@@ -233,13 +374,28 @@ class QdrantService(VectorService):
                 )
             )
 
-        self.client.upsert(collection_name=self.index_name, wait=True, points=points)
+        # Batched upserts run concurrently over gRPC instead of serializing
+        # one giant upsert request.
+        await asyncio.gather(
+            *[
+                self.client.upsert(
+                    collection_name=self.index_name,
+                    wait=True,
+                    points=points[i : i + QDRANT_UPSERT_BATCH_SIZE],
+                )
+                for i in range(0, len(points), QDRANT_UPSERT_BATCH_SIZE)
+            ]
+        )
 
     async def query(self, input: str, top_k: int) -> List:
         vectors = await self._generate_vectors(input=input)
-        search_result = self.client.search(
+        return await self._search_with_vector(vectors[0], top_k)
+
+    async def _search_with_vector(self, vector: List[float], top_k: int) -> List:
+        await self._ensure_collection()
+        search_result = await self.client.search(
             collection_name=self.index_name,
-            query_vector=("content", vectors[0]),
+            query_vector=("content", vector),
             limit=top_k,
             with_payload=True,
         )
@@ -256,7 +412,8 @@ class QdrantService(VectorService):
         ]
 
     async def delete(self, file_url: str) -> None:
-        self.client.delete(
+        await self._ensure_collection()
+        await self.client.delete(
             collection_name=self.index_name,
             points_selector=rest.FilterSelector(
                 filter=rest.Filter(
@@ -285,8 +442,11 @@ class WeaviateService(VectorService):
             url=credentials["host"],
             auth_client_secret=weaviate.AuthApiKey(api_key=credentials["api_key"]),
         )
+        # Weaviate capitalizes class names; cache the canonical form once so
+        # schema creation, upsert and query all agree on it.
+        self._class_name = index_name.capitalize()
         schema = {
-            "class": self.index_name,
+            "class": self._class_name,
             "properties": [
                 {
                     "name": "text",
@@ -294,52 +454,62 @@ class WeaviateService(VectorService):
                 }
             ],
         }
-        if not self.client.schema.exists(self.index_name):
-            self.client.schema.create_class(schema)
+        cache_key = _index_cache_key("weaviate", self._class_name, credentials)
+        if not _INDEX_EXISTS_CACHE.get(cache_key):
+            if not self.client.schema.exists(self._class_name):
+                self.client.schema.create_class(schema)
+            _INDEX_EXISTS_CACHE[cache_key] = True
 
     # TODO: add response model
     async def upsert(self, chunks: List[BaseDocumentChunk]) -> None:
         if not self.client:
             raise ValueError("Weaviate client is not initialized.")
 
+        # Batch workers are thread-based and network-bound, so 8 keeps the
+        # connection busy without overwhelming the server.
         self.client.batch.configure(
             batch_size=100,
             dynamic=True,
             timeout_retries=3,
             connection_error_retries=3,
             callback=None,
-            num_workers=2,
+            num_workers=8,
         )
 
+        logger.info(
+            f"Upserting {len(chunks)} chunks to Weaviate index {self.index_name}"
+        )
         with self.client.batch as batch:
-            for chunk in tqdm(
-                chunks, desc=f"Upserting to Weaviate index {self.index_name}"
-            ):
-                vector_data = {
-                    "uuid": chunk.id,
-                    "data_object": {
+            for chunk in chunks:
+                batch.add_data_object(
+                    data_object={
                         "text": chunk.content,
                         "document_id": chunk.document_id,
                         "doc_url": chunk.doc_url,
                         **(chunk.metadata if chunk.metadata else {}),
                     },
-                    "class_name": self.index_name,
-                    "vector": chunk.dense_embedding,
-                }
-                batch.add_data_object(**vector_data)
+                    class_name=self._class_name,
+                    uuid=chunk.id,
+                    vector=chunk.dense_embedding,
+                )
             batch.flush()
 
     async def query(self, input: str, top_k: int = 25) -> list[BaseDocumentChunk]:
         vectors = await self._generate_vectors(input=input)
-        vector = {"vector": vectors[0]}
+        return await self._search_with_vector(vectors[0], top_k)
+
+    async def _search_with_vector(
+        self, vector: List[float], top_k: int
+    ) -> list[BaseDocumentChunk]:
+        near_vector = {"vector": vector}
 
         try:
-            response = (
-                self.client.query.get(
-                    class_name=self.index_name.capitalize(),
+            response = await asyncio.to_thread(
+                lambda: self.client.query.get(
+                    class_name=self._class_name,
                     properties=["document_id", "text", "doc_url", "page_number"],
                 )
-                .with_near_vector(vector)
+                .with_near_vector(near_vector)
                 .with_limit(top_k)
                 .do()
             )
@@ -347,7 +517,7 @@ class WeaviateService(VectorService):
                 logger.error(f"Missing 'data' in response: {response}")
                 return []
 
-            result_data = response["data"]["Get"][self.index_name.capitalize()]
+            result_data = response["data"]["Get"][self._class_name]
             document_chunks = []
             for result in result_data:
                 document_chunk = BaseDocumentChunk(
@@ -361,7 +531,7 @@ class WeaviateService(VectorService):
                 document_chunks.append(document_chunk)
             return document_chunks
         except KeyError as e:
-            logger.error(f"KeyError in response: Missing key {e} - Query: {input}")
+            logger.error(f"KeyError in response: Missing key {e}")
             return []
         except Exception as e:
             logger.error(f"Error querying Weaviate: {e}")
@@ -372,7 +542,7 @@ class WeaviateService(VectorService):
             f"Deleting from Weaviate index {self.index_name}, file_url: {file_url}"
         )
         result = self.client.batch.delete_objects(
-            class_name=self.index_name,
+            class_name=self._class_name,
             where={"path": ["doc_url"], "operator": "Equal", "valueText": file_url},
         )
         num_of_deleted_chunks = result.get("results", {}).get("successful", 0)
@@ -393,42 +563,50 @@ class AstraService(VectorService):
             token=credentials["api_key"],
             api_endpoint=credentials["host"],
         )
-        collections = self.client.get_collections()
-        if self.index_name not in collections["status"]["collections"]:
-            self.collection = self.client.create_collection(
-                dimension=dimension, collection_name=index_name
-            )
+        cache_key = _index_cache_key("astra", self.index_name, credentials)
+        if not _INDEX_EXISTS_CACHE.get(cache_key):
+            collections = self.client.get_collections()
+            if self.index_name not in collections["status"]["collections"]:
+                self.client.create_collection(
+                    dimension=dimension, collection_name=index_name
+                )
+            _INDEX_EXISTS_CACHE[cache_key] = True
         self.collection = self.client.collection(collection_name=self.index_name)
 
-    # TODO: remove this
-    async def convert_to_rerank_format(self, chunks: List) -> List:
-        docs = [
-            {
-                "content": chunk.get("text"),
-                "page_label": chunk.get("page_label"),
-                "file_url": chunk.get("file_url"),
-            }
-            for chunk in chunks
-        ]
-        return docs
-
     async def upsert(self, chunks: List[BaseDocumentChunk]) -> None:
         documents = [
             {
                 "_id": chunk.id,
                 "text": chunk.content,
                 "$vector": chunk.dense_embedding,
-                **chunk.metadata,
+                **(chunk.metadata if chunk.metadata else {}),
             }
-            for chunk in tqdm(chunks, desc="Upserting to Astra")
+            for chunk in chunks
         ]
-        for i in range(0, len(documents), 5):
-            self.collection.insert_many(documents=documents[i : i + 5])
+        logger.info(f"Upserting {len(documents)} chunks to Astra")
+        # insert_many is sync and each call is one RTT; run the batches in
+        # parallel with a cap to stay clear of Astra rate limits.
+        semaphore = asyncio.Semaphore(ASTRA_UPSERT_CONCURRENCY)
+
+        async def insert_batch(batch: List[dict]) -> None:
+            async with semaphore:
+                await asyncio.to_thread(self.collection.insert_many, documents=batch)
+
+        await asyncio.gather(
+            *[
+                insert_batch(documents[i : i + ASTRA_UPSERT_BATCH_SIZE])
+                for i in range(0, len(documents), ASTRA_UPSERT_BATCH_SIZE)
+            ]
+        )
 
     async def query(self, input: str, top_k: int = 4) -> List:
         vectors = await self._generate_vectors(input=input)
-        results = self.collection.vector_find(
-            vector=vectors[0],
+        return await self._search_with_vector(vectors[0], top_k)
+
+    async def _search_with_vector(self, vector: List[float], top_k: int) -> List:
+        results = await asyncio.to_thread(
+            self.collection.vector_find,
+            vector=vector,
             limit=top_k,
             fields={"text", "page_number", "source", "document_id"},
         )
@@ -447,6 +625,13 @@ class AstraService(VectorService):
         self.collection.delete_many(filter={"file_url": file_url})
 
 
+# Service instances keyed on (provider, index name, dimension, credentials,
+# encoder class) so their client connection pools persist across requests.
+# Bounded so idle clients (and their open connections) get evicted instead
+# of accumulating forever across tenants and indexes.
+_SERVICE_CACHE: LRUCache = LRUCache(maxsize=32)
+
+
 def get_vector_service(
     *,
     index_name: str,
@@ -464,9 +649,36 @@ def get_vector_service(
     service = services.get(credentials.type.value)
     if service is None:
         raise ValueError(f"Unsupported provider: {credentials.type.value}")
-    return service(
-        index_name=index_name,
-        dimension=encoder.dimension,
-        credentials=dict(credentials.config),
-        encoder=encoder,
+    credentials_dict = dict(credentials.config)
+    cache_key = (
+        credentials.type.value,
+        index_name,
+        encoder.dimension,
+        tuple(sorted(credentials_dict.items())),
+        type(encoder).__name__,
+    )
+    cached_service = _SERVICE_CACHE.get(cache_key)
+    if cached_service is None:
+        cached_service = service(
+            index_name=index_name,
+            dimension=encoder.dimension,
+            credentials=credentials_dict,
+            encoder=encoder,
+        )
+        _SERVICE_CACHE[cache_key] = cached_service
+    return cached_service
+
+
+async def query_fanout(
+    services: List[VectorService], input: str, top_k: int = 25
+) -> List[List[BaseDocumentChunk]]:
+    """Query several indexes/providers concurrently.
+
+    The input is embedded once and each service searches with the same
+    vector, so total latency is the slowest provider rather than the sum.
+    All services must share the encoder's dimension.
+    """
+    vectors = await services[0]._generate_vectors(input=input)
+    return await asyncio.gather(
+        *[service._search_with_vector(vectors[0], top_k) for service in services]
     )